@@ -2,9 +2,10 @@ from __future__ import absolute_import, print_function
 from qtpy import  QtCore, QtWidgets, QtGui
 import pyqtgraph
 import numpy as np
-from collections import OrderedDict
+from contextlib import contextmanager, ExitStack
 import json
 import sys
+import logging
 from ScopeFoundry.helper_funcs import get_logger_from_class, str2bool, QLock, \
     bool2str
 from ScopeFoundry.ndarray_interactive import ArrayLQ_QTableModel
@@ -13,6 +14,12 @@ from inspect import signature
 from ScopeFoundry.widgets import MinMaxQSlider
 import os
 
+# numba is optional, used to speed up LQRange calculations
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 #import threading
 
 # python 2/3 compatibility
@@ -65,6 +72,24 @@ class LoggedQuantity(QtCore.QObject):
     # signal sent when read only (ro) status has changed 
     updated_readonly = QtCore.Signal((bool,), (),) 
     
+    # display update state used by batch() and suppress()
+    _silenced = False
+    _batch_depth = 0
+    _batch_pending = False
+    _batch_force = False
+    
+    # set by force_next_read()
+    _force_next_read = False
+    
+    # if True, _same_as_current uses == instead of same_values, see __init__
+    _compare_directly = False
+    # if True, _coerce_new_value skips coerce_to_type for values of dtype
+    _skip_coerce = False
+    
+    # choice values and (value --> index) lookup, kept in sync with self.choices
+    _choice_vals = None
+    _choice_index = None
+    
     def __init__(self, name, dtype=float, 
                  #hardware_read_func=None, hardware_set_func=None, 
                  initial=0, fmt="%g", si=False,
@@ -100,7 +125,7 @@ class LoggedQuantity(QtCore.QObject):
         self.vmin = vmin
         self.vmax = vmax
         # choices should be tuple [ ('name', val) ... ] or simple list [val, val, ...]
-        self.choices = self._expand_choices(choices) 
+        self._set_choices(choices)
         self.ro = ro # Read-Only
         self.is_array = False
         self.description = description
@@ -120,14 +145,11 @@ class LoggedQuantity(QtCore.QObject):
         
         if self.dtype == int:
             self.spinbox_decimals = 0
-        else:
-            self.spinbox_decimals = spinbox_decimals
-        self.reread_from_hardware_after_write = reread_from_hardware_after_write
-        
-        if self.dtype == int:
             self.spinbox_step = 1
         else:
+            self.spinbox_decimals = spinbox_decimals
             self.spinbox_step = spinbox_step
+        self.reread_from_hardware_after_write = reread_from_hardware_after_write
         
         self.oldval = None
         
@@ -141,6 +163,36 @@ class LoggedQuantity(QtCore.QObject):
         #self.lock = DummyLock()
         self.lock = QLock(mode=1) # mode 0 is non-reentrant lock
         
+        self._bind_signals()
+        
+        self._compare_directly = (self.dtype in (int, float, bool, str)
+                                  and type(self).same_values is LoggedQuantity.same_values)
+        self._skip_coerce = type(self).coerce_to_type in _PLAIN_COERCE_TO_TYPE
+        
+    def _bind_signals(self):
+        """
+        keep references to the bound signals (and their emit methods) and to
+        same_values, so that send_display_updates does not need to look
+        them up on every emit
+        """
+        self._sig_void = self.updated_value[()]
+        self._sig_str = self.updated_value[str]
+        self._sig_float = self.updated_value[float]
+        self._sig_int = self.updated_value[int]
+        self._sig_bool = self.updated_value[bool]
+        self._sig_text = self.updated_text_value
+        self._sig_choice = self.updated_choice_index_value
+        
+        self._emit_void = self._sig_void.emit
+        self._emit_str = self._sig_str.emit
+        self._emit_float = self._sig_float.emit
+        self._emit_int = self._sig_int.emit
+        self._emit_bool = self._sig_bool.emit
+        self._emit_text = self._sig_text.emit
+        self._emit_choice = self._sig_choice.emit
+        
+        self._same_values = self.same_values
+    
     def coerce_to_type(self, x):
         """
         Force x to dtype of the LQ
@@ -180,6 +232,22 @@ class LoggedQuantity(QtCore.QObject):
                 expanded_choices.append( ( str(c), self.dtype(c) ) )
         return expanded_choices
     
+    def _set_choices(self, choices):
+        """
+        sets self.choices from *choices* and updates the cached choice values
+        used when emitting updated_choice_index_value
+        """
+        self.choices = self._expand_choices(choices)
+        if self.choices is None:
+            self._choice_vals = None
+            self._choice_index = None
+        else:
+            self._choice_vals = tuple(val for _, val in self.choices)
+            self._choice_index = dict()
+            for i, val in enumerate(self._choice_vals):
+                # keep the first index if a value is repeated
+                self._choice_index.setdefault(val, i)
+    
     def __str__(self):
         return "{} = {}".format(self.name, self.val)
     
@@ -187,13 +255,48 @@ class LoggedQuantity(QtCore.QObject):
         return "LQ: {} = {}".format(self.name, self.val)
 
     
+    def _coerce_new_value(self, new_val):
+        """
+        coerce_to_type, skipped for values that already are of dtype if
+        coerce_to_type is not overridden. (self.val is always stored as dtype)
+        """
+        if self._skip_coerce and type(new_val) is self.dtype:
+            return new_val
+        return self.coerce_to_type(new_val)
+    
+    def _same_as_current(self, new_val):
+        """
+        True if the coerced *new_val* equals the stored value.
+        Builtin scalar dtypes without a same_values override compare
+        directly, everything else uses same_values
+        """
+        if self._compare_directly:
+            return new_val == self.val
+        return self._same_values(self.val, new_val)
+    
+    def force_next_read(self):
+        """
+        makes the next read_from_hardware (with send_signal=True) send display
+        updates even if the value read is unchanged
+        """
+        self._force_next_read = True
+    
     def read_from_hardware(self, send_signal=True):
         self.log.debug("{}: read_from_hardware send_signal={}".format(self.name, send_signal))
         if self.hardware_read_func is not None:        
             with self.lock:
-                self.oldval = self.val
-                val = self.hardware_read_func()
-            self.update_value(new_val=val, update_hardware=False, send_signal=send_signal)
+                val = self._coerce_new_value(self.hardware_read_func())
+                force = self._force_next_read
+                if send_signal:
+                    # keep the force for a later read if no updates are sent now
+                    self._force_next_read = False
+                changed = not self._same_as_current(val)
+                if changed:
+                    self.oldval = self.val
+                    self.val = val
+            # only send updates if the hardware value changed (or forced)
+            if send_signal and (changed or force):
+                self.send_display_updates(force=force)
         else:
             self.log.warn("{} read_from_hardware called when not connected to hardware".format(self.name))
         return self.val
@@ -252,22 +355,22 @@ class LoggedQuantity(QtCore.QObject):
             if new_val is None:
                 if hasattr(self.sender(), 'text'):
                     new_val = self.sender().text()
-    
-            self.oldval = self.coerce_to_type(self.val)
-            new_val = self.coerce_to_type(new_val)
-            
+
+            coerced = self._coerce_new_value(new_val)
+
             self.log.debug("{}: update_value {} --> {}    sender={}".format(
-                            self.name, repr(self.oldval), repr(new_val), repr(self.sender())))
-    
+                            self.name, repr(self.val), repr(coerced), repr(self.sender())))
+
             # check for equality of new vs old, do not proceed if they are same
-            if self.same_values(self.oldval, new_val):
-                self.log.debug("{}: same_value so returning {} {}".format(self.name, self.oldval, new_val))
+            if self._same_as_current(coerced):
+                self.log.debug("{}: same_value so returning {} {}".format(self.name, self.val, coerced))
                 return
             else:
-                self.log.debug("{}: different values {} {}".format(self.name, self.oldval, new_val))
-                
+                self.log.debug("{}: different values {} {}".format(self.name, self.val, coerced))
+
             # actually change internal state value
-            self.val = new_val
+            self.oldval = self.val
+            self.val = coerced
         
         
         # Read from Hardware
@@ -279,6 +382,21 @@ class LoggedQuantity(QtCore.QObject):
         if send_signal:
             self.send_display_updates()
             
+    # single signature slots, used for widget signals with a known argument
+    # type, avoid the overload resolution of the update_value slot
+    
+    @QtCore.Slot(float)
+    def _update_from_float(self, new_val):
+        self.update_value(new_val)
+    
+    @QtCore.Slot(int)
+    def _update_from_int(self, new_val):
+        self.update_value(new_val)
+    
+    @QtCore.Slot(bool)
+    def _update_from_bool(self, new_val):
+        self.update_value(new_val)
+    
     def send_display_updates(self, force=False):
         """
         Emit updated_value signals if value has changed.
@@ -292,30 +410,116 @@ class LoggedQuantity(QtCore.QObject):
         
         """
         #self.log.debug("{}:send_display_updates: force={}. From {} to {}".format(self.name, force, self.oldval, self.val))
-        if (not self.same_values(self.oldval, self.val)) or (force):
-            self.updated_value[()].emit()
+        if self._hold_display_updates(force):
+            return
+        val = self.val
+        if force or (not self._same_values(self.oldval, val)):
+            self._emit_void()
             
-            str_val = self.string_value()
-            self.updated_value[str].emit(str_val)
-            self.updated_text_value.emit(str_val)
+            self._emit_string_value()
                 
-            if self.dtype in [float, int]:
-                self.updated_value[float].emit(self.val)
-                self.updated_value[int].emit(int(self.val))
-            self.updated_value[bool].emit(bool(self.val))
+            # typed overloads are only emitted if something is connected
+            has_receivers = self._has_receivers
+            dtype = self.dtype
+            if dtype is float or dtype is int:
+                if has_receivers(self._sig_float):
+                    self._emit_float(val)
+                if has_receivers(self._sig_int):
+                    self._emit_int(int(val))
+            if has_receivers(self._sig_bool):
+                self._emit_bool(bool(val))
             
-            if self.choices is not None:
-                choice_vals = [c[1] for c in self.choices]
-                if self.val in choice_vals:
-                    self.updated_choice_index_value.emit(choice_vals.index(self.val) )
-            self.oldval = self.val
+            choice_index = self._choice_index
+            if choice_index is not None:
+                idx = choice_index.get(val)
+                if idx is not None:
+                    self._emit_choice(idx)
+            self.oldval = val
         else:
             # no updates sent
             pass
     
+    def _has_receivers(self, signal):
+        """returns True if anything is connected to the bound *signal*"""
+        try:
+            return self.receivers(signal) > 0
+        except TypeError:
+            # Qt binding does not take bound signals, assume connected
+            return True
+    
+    def _emit_string_value(self):
+        """
+        emits the text representation of the value on updated_value[str]
+        and updated_text_value. string_value() is only computed if one
+        of them has receivers.
+        """
+        has_str = self._has_receivers(self._sig_str)
+        has_text = self._has_receivers(self._sig_text)
+        if not (has_str or has_text):
+            return
+        str_val = self.string_value()
+        if has_str:
+            self._emit_str(str_val)
+        if has_text:
+            self._emit_text(str_val)
+    
+    def _hold_display_updates(self, force):
+        """
+        returns True if display updates should not be emitted now, either
+        because the LQ is suppressed, or because it is batched, in which case
+        a single update is sent when the batch ends.
+        """
+        if self._silenced:
+            return True
+        if self._batch_depth:
+            self._batch_pending = True
+            self._batch_force = self._batch_force or force
+            return True
+        return False
+    
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that defers display updates (signals) until the end
+        of the block. Any number of value changes inside the block result
+        in at most one set of signals, carrying the final value.
+        
+        >>> with lq.batch():
+        ...     lq.update_value(1)
+        ...     lq.update_value(2) # listeners only see 2
+        
+        Batches may be nested, signals are sent when the outermost exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_pending:
+                force = self._batch_force
+                self._batch_pending = False
+                self._batch_force = False
+                self.send_display_updates(force=force)
+    
+    @contextmanager
+    def suppress(self):
+        """
+        Context manager that drops display updates (signals) inside the block.
+        Connected widgets are not updated, use send_display_updates(force=True)
+        to resync them if needed.
+        """
+        silenced = self._silenced
+        self._silenced = True
+        try:
+            yield self
+        finally:
+            self._silenced = silenced
+    
     def same_values(self, v1, v2):
         """ 
-        Compares two values of the LQ type, used in update_value
+        Compares two values of the LQ type, used in update_value and
+        read_from_hardware. Subclasses may override it, e.g. to compare
+        with a tolerance.
 
         =============  ====================
         **Arguments**  **Description**
@@ -418,231 +622,11 @@ class LoggedQuantity(QtCore.QObject):
         """
         
         self.set_widget_toolTip(widget)
-       
-        if type(widget) == QtWidgets.QDoubleSpinBox:
-
-            widget.setKeyboardTracking(False)
-            if self.vmin is not None:
-                widget.setMinimum(self.vmin)
-            if self.vmax is not None:
-                widget.setMaximum(self.vmax)
-            if self.unit is not None:
-                widget.setSuffix(" "+self.unit)
-            widget.setDecimals(self.spinbox_decimals)
-            widget.setSingleStep(self.spinbox_step)
-            widget.setValue(self.val)
-            #events
-            def update_widget_value(x):
-                """
-                block signals from widget when value is set via lq.update_value.
-                This prevents signal-slot loops between widget and lq
-                """
-                try:
-                    widget.blockSignals(True)
-                    widget.setValue(x)
-                finally:
-                    widget.blockSignals(False)                    
-            #self.updated_value[float].connect(widget.setValue)
-            self.updated_value[float].connect(update_widget_value)
-            #if not self.ro:
-            widget.valueChanged[float].connect(self.update_value)
-        
-        elif type(widget) == MinMaxQSlider:
-            self.updated_value[float].connect(widget.update_value)
-            widget.updated_value[float].connect(self.update_value)
-            if self.unit is not None:
-                widget.setSuffix(self.unit)
-            widget.setSingleStep(self.spinbox_step)
-            widget.setDecimals(self.spinbox_decimals)
-            widget.setRange(self.vmin, self.vmax)
-            widget.set_name(self.name)
-        
-        elif type(widget) == QtWidgets.QSlider:
-            if self.dtype == float:
-                self.vrange = self.vmax - self.vmin
-                def transform_to_slider(x):
-                    pct = 100*(x-self.vmin)/self.vrange
-                    return int(pct)
-                def transform_from_slider(x):
-                    val = self.vmin + (x*self.vrange/100)
-                    return val
-                def update_widget_value(x):
-                    """
-                    block signals from widget when value is set via lq.update_value.
-                    This prevents signal-slot loops between widget and lq
-                    """
-                    try:
-                        widget.blockSignals(True)
-                        widget.setValue(transform_to_slider(x))
-                    finally:
-                        widget.blockSignals(False)
-                        
-                def update_spinbox(x):
-                    self.update_value(transform_from_slider(x))    
-                if self.vmin is not None:
-                    widget.setMinimum(transform_to_slider(self.vmin))
-                if self.vmax is not None:
-                    widget.setMaximum(transform_to_slider(self.vmax))
-                widget.setSingleStep(1)
-                widget.setValue(transform_to_slider(self.val))
-                self.updated_value[float].connect(update_widget_value)
-                widget.valueChanged[int].connect(update_spinbox)
-            elif self.dtype == int:
-                self.updated_value[int].connect(widget.setValue)
-                #widget.sliderMoved[int].connect(self.update_value)
-                widget.valueChanged[int].connect(self.update_value)
-                
-                widget.setSingleStep(1)            
-                
-        elif type(widget) == QtWidgets.QCheckBox:
-
-            def update_widget_value(x):
-                lq = widget.sender()
-                #self.log.debug("LQ {} update qcheckbox: {} arg{} lq value{}".format(lq.name,   widget, x, lq.value))                
-                widget.setChecked(lq.value)                    
-
-            self.updated_value[bool].connect(update_widget_value)
-            widget.clicked[bool].connect(self.update_value) # another option is stateChanged signal
-            if self.ro:
-                #widget.setReadOnly(True)
-                widget.setEnabled(False)
-                
-            if self.colors != None:
-                if len(self.colors) in (2,3): # QCheckBoxes can have 3 states! (tristate)
-                    if len(self.colors) == 2:
-                        colors = [self.colors[0], 'lightgrey', self.colors[1]]
-                    elif len(self.qcolors) == 3:
-                        colors = self.colors
-                    s = f"""QCheckBox:!checked {{ background: {colors[0]} }}
-                            QCheckBox:checked  {{ background: {colors[2]} }}"""
-                    widget.setStyleSheet(widget.styleSheet() + s)
-                
-                                
-        elif type(widget) == QtWidgets.QLineEdit:
-            self.updated_text_value[str].connect(widget.setText)
-            self.updated_value[str].connect(widget.setText)
-            if self.ro:
-                widget.setReadOnly(True)  # FIXME
-            def on_edit_finished():
-                self.log.debug(self.name + " qLineEdit on_edit_finished")
-                try:
-                    widget.blockSignals(True)
-                    self.update_value(widget.text())
-                finally:
-                    widget.blockSignals(False)
-            widget.editingFinished.connect(on_edit_finished)
-            
-        elif type(widget) == QtWidgets.QPlainTextEdit:
-            # TODO Read only
-            
-            def on_lq_changed(new_text):
-                current_cursor = widget.textCursor()
-                current_cursor_pos = current_cursor.position()
-                #print('current_cursor', current_cursor, current_cursor.position())
-                widget.document().setPlainText(new_text)
-                current_cursor.setPosition(current_cursor_pos)
-                widget.setTextCursor(current_cursor)
-                #print('current_cursor', current_cursor, current_cursor.position())
-            
-            def on_widget_textChanged():
-                try:
-                    widget.blockSignals(True)
-                    self.update_value(widget.toPlainText())
-                finally:
-                    widget.blockSignals(False)
-
-            #self.updated_text_value[str].connect(widget.document().setPlainText)
-            self.updated_text_value[str].connect(on_lq_changed)
-            widget.textChanged.connect(on_widget_textChanged)
-            
-        elif type(widget) == QtWidgets.QComboBox:
-            # need to have a choice list to connect to a QComboBox
-            assert self.choices is not None 
-            widget.clear() # removes all old choices
-            for choice_name, choice_value in self.choices:
-                widget.addItem(choice_name, choice_value)
-            self.updated_choice_index_value[int].connect(widget.setCurrentIndex)
-            widget.currentIndexChanged.connect(self.update_choice_index_value)
-            if self.colors != None:
-                if len(self.qcolors) == len(self.choices):
-                    for i,qcolor in enumerate(self.qcolors):
-                        widget.setItemData(i,  qcolor, QtCore.Qt.BackgroundRole )
-                        
-                    def update_background_color(idx):
-                        qcolor = self.qcolors[idx]
-                        s = f"""QComboBox{{
-                                    selection-background-color: {qcolor.name()};
-                                    selection-color: black;
-                                    background: {qcolor.name()};
-                                    }}"""                      
-                        widget.setStyleSheet(widget.styleSheet() + s)
-                    widget.currentIndexChanged.connect(update_background_color)
-            
-        elif type(widget) == pyqtgraph.widgets.SpinBox.SpinBox:
-            #widget.setFocusPolicy(QtCore.Qt.StrongFocus)
-            suffix = self.unit
-            if self.unit is None:
-                suffix = ""
-            if self.dtype == int:
-                integer = True
-                minStep=1
-                step=1
-            else:
-                integer = False
-                minStep=.1
-                step=.1
-            opts = dict(
-                        suffix=suffix,
-                        siPrefix=True,
-                        dec=True,
-                        step=step,
-                        minStep=minStep,
-                        bounds=[self.vmin, self.vmax],
-                        int=integer)
-            if self.si:
-                del opts['step']
-                del opts['minStep']
-            
-            widget.setOpts(**opts)
-                      
-            if self.ro:
-                widget.setEnabled(False)
-                widget.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
-                widget.setReadOnly(True)
-            #widget.setDecimals(self.spinbox_decimals)
-            if not self.si:
-                widget.setSingleStep(self.spinbox_step)
-            #self.updated_value[float].connect(widget.setValue)
-            #if not self.ro:
-                #widget.valueChanged[float].connect(self.update_value)
-            def update_widget_value(x):
-                """
-                block signals from widget when value is set via lq.update_value.
-                This prevents signal loops
-                """
-                try:
-                    widget.blockSignals(True)
-                    widget.setValue(x)
-                finally:
-                    widget.blockSignals(False)                    
-            self.updated_value[float].connect(update_widget_value)
-            def on_widget_update(_widget):
-                self.update_value(_widget.value())
-            widget.sigValueChanged.connect(on_widget_update)
-            
 
-
-        elif type(widget) == QtWidgets.QLabel:
-            self.updated_text_value.connect(widget.setText)
-        elif type(widget) == QtWidgets.QProgressBar:
-            def set_progressbar(x, widget=widget):
-                self.log.debug("set_progressbar {}".format(x))
-                widget.setValue(int(x))
-            self.updated_value.connect(set_progressbar)
-        elif type(widget) == QtWidgets.QLCDNumber:
-            self.updated_value[(self.dtype)].connect(widget.display)
-        else:
+        binder = _WIDGET_BINDERS.get(type(widget))
+        if binder is None:
             raise ValueError("Unknown widget type")
+        binder(self, widget, bidir=True)
         
         self.send_display_updates(force=True)
         #self.widget = widget
@@ -657,200 +641,11 @@ class LoggedQuantity(QtCore.QObject):
         """
         
         self.set_widget_toolTip(widget)
-       
-        if type(widget) == QtWidgets.QDoubleSpinBox:
-
-            widget.setKeyboardTracking(False)
-            if self.vmin is not None:
-                widget.setMinimum(self.vmin)
-            if self.vmax is not None:
-                widget.setMaximum(self.vmax)
-            if self.unit is not None:
-                widget.setSuffix(" "+self.unit)
-            widget.setDecimals(self.spinbox_decimals)
-            widget.setSingleStep(self.spinbox_step)
-            widget.setValue(self.val)
-            #events
-            def update_widget_value(x):
-                """
-                block signals from widget when value is set via lq.update_value.
-                This prevents signal-slot loops between widget and lq
-                """
-                try:
-                    widget.blockSignals(True)
-                    widget.setValue(x)
-                finally:
-                    widget.blockSignals(False)                    
-            #self.updated_value[float].connect(widget.setValue)
-            self.updated_value[float].connect(update_widget_value)
-        
-        elif type(widget) == MinMaxQSlider:
-            self.updated_value[float].connect(widget.update_value)
-            if self.unit is not None:
-                widget.setSuffix(self.unit)
-            widget.setSingleStep(self.spinbox_step)
-            widget.setDecimals(self.spinbox_decimals)
-            widget.setRange(self.vmin, self.vmax)
-            widget.set_name(self.name)
-        
-        elif type(widget) == QtWidgets.QSlider:
-            if self.dtype == float:
-                self.vrange = self.vmax - self.vmin
-                def transform_to_slider(x):
-                    pct = 100*(x-self.vmin)/self.vrange
-                    return int(pct)
-                def transform_from_slider(x):
-                    val = self.vmin + (x*self.vrange/100)
-                    return val
-                def update_widget_value(x):
-                    """
-                    block signals from widget when value is set via lq.update_value.
-                    This prevents signal-slot loops between widget and lq
-                    """
-                    try:
-                        widget.blockSignals(True)
-                        widget.setValue(transform_to_slider(x))
-                    finally:
-                        widget.blockSignals(False)
-                         
-                if self.vmin is not None:
-                    widget.setMinimum(transform_to_slider(self.vmin))
-                if self.vmax is not None:
-                    widget.setMaximum(transform_to_slider(self.vmax))
-                widget.setSingleStep(1)
-                widget.setValue(transform_to_slider(self.val))
-                self.updated_value[float].connect(update_widget_value)
-            elif self.dtype == int:
-                self.updated_value[int].connect(widget.setValue)
-                widget.setSingleStep(1)            
-                
-        elif type(widget) == QtWidgets.QCheckBox:
-
-            def update_widget_value(x):
-                lq = widget.sender()
-                #self.log.debug("LQ {} update qcheckbox: {} arg{} lq value{}".format(lq.name,   widget, x, lq.value))                
-                widget.setChecked(lq.value)                    
 
-            self.updated_value[bool].connect(update_widget_value)
-            if self.ro:
-                #widget.setReadOnly(True)
-                widget.setEnabled(False)
-                
-            if self.colors != None:
-                if len(self.colors) in (2,3): # QCheckBoxes can have 3 states! (tristate)
-                    if len(self.colors) == 2:
-                        colors = [self.colors[0], 'lightgrey', self.colors[1]]
-                    elif len(self.qcolors) == 3:
-                        colors = self.colors
-                    s = f"""QCheckBox:!checked {{ background: {colors[0]} }}
-                            QCheckBox:checked  {{ background: {colors[2]} }}"""
-                    widget.setStyleSheet(widget.styleSheet() + s)
-                
-                                
-        elif type(widget) == QtWidgets.QLineEdit:
-            self.updated_text_value[str].connect(widget.setText)
-            self.updated_value[str].connect(widget.setText)
-            if self.ro:
-                widget.setReadOnly(True)  # FIXME
-            
-        elif type(widget) == QtWidgets.QPlainTextEdit:
-            # TODO Read only
-            
-            def on_lq_changed(new_text):
-                current_cursor = widget.textCursor()
-                current_cursor_pos = current_cursor.position()
-                #print('current_cursor', current_cursor, current_cursor.position())
-                widget.document().setPlainText(new_text)
-                current_cursor.setPosition(current_cursor_pos)
-                widget.setTextCursor(current_cursor)
-                #print('current_cursor', current_cursor, current_cursor.position())
-
-            #self.updated_text_value[str].connect(widget.document().setPlainText)
-            self.updated_text_value[str].connect(on_lq_changed)
-            
-        elif type(widget) == QtWidgets.QComboBox:
-            # need to have a choice list to connect to a QComboBox
-            assert self.choices is not None 
-            widget.clear() # removes all old choices
-            for choice_name, choice_value in self.choices:
-                widget.addItem(choice_name, choice_value)
-            self.updated_choice_index_value[int].connect(widget.setCurrentIndex)
-            if self.colors != None:
-                if len(self.qcolors) == len(self.choices):
-                    for i,qcolor in enumerate(self.qcolors):
-                        widget.setItemData(i,  qcolor, QtCore.Qt.BackgroundRole )
-                        
-                    def update_background_color(idx):
-                        qcolor = self.qcolors[idx]
-                        s = f"""QComboBox{{
-                                    selection-background-color: {qcolor.name()};
-                                    selection-color: black;
-                                    background: {qcolor.name()};
-                                    }}"""                      
-                        widget.setStyleSheet(widget.styleSheet() + s)
-                    widget.currentIndexChanged.connect(update_background_color)
-            
-        elif type(widget) == pyqtgraph.widgets.SpinBox.SpinBox:
-            #widget.setFocusPolicy(QtCore.Qt.StrongFocus)
-            suffix = self.unit
-            if self.unit is None:
-                suffix = ""
-            if self.dtype == int:
-                integer = True
-                minStep=1
-                step=1
-            else:
-                integer = False
-                minStep=.1
-                step=.1
-            opts = dict(
-                        suffix=suffix,
-                        siPrefix=True,
-                        dec=True,
-                        step=step,
-                        minStep=minStep,
-                        bounds=[self.vmin, self.vmax],
-                        int=integer)
-            if self.si:
-                del opts['step']
-                del opts['minStep']
-            
-            widget.setOpts(**opts)
-                      
-            if self.ro:
-                widget.setEnabled(False)
-                widget.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
-                widget.setReadOnly(True)
-            #widget.setDecimals(self.spinbox_decimals)
-            if not self.si:
-                widget.setSingleStep(self.spinbox_step)
-            #self.updated_value[float].connect(widget.setValue)
-            #if not self.ro:
-                #widget.valueChanged[float].connect(self.update_value)
-            def update_widget_value(x):
-                """
-                block signals from widget when value is set via lq.update_value.
-                This prevents signal loops
-                """
-                try:
-                    widget.blockSignals(True)
-                    widget.setValue(x)
-                finally:
-                    widget.blockSignals(False)                    
-            self.updated_value[float].connect(update_widget_value)
-            
-
-        elif type(widget) == QtWidgets.QLabel:
-            self.updated_text_value.connect(widget.setText)
-        elif type(widget) == QtWidgets.QProgressBar:
-            def set_progressbar(x, widget=widget):
-                self.log.debug("set_progressbar {}".format(x))
-                widget.setValue(int(x))
-            self.updated_value.connect(set_progressbar)
-        elif type(widget) == QtWidgets.QLCDNumber:
-            self.updated_value[(self.dtype)].connect(widget.display)
-        else:
+        binder = _WIDGET_BINDERS.get(type(widget))
+        if binder is None:
             raise ValueError("Unknown widget type")
+        binder(self, widget, bidir=False)
         
         self.send_display_updates(force=True)
         #self.widget = widget
@@ -872,7 +667,7 @@ class LoggedQuantity(QtCore.QObject):
             pushButton.setChecked(lq.value)
             pushButton.setText(texts[int(x)])              
         self.updated_value[bool].connect(update_pushButton_value)
-        pushButton.toggled[bool].connect(self.update_value)
+        pushButton.toggled[bool].connect(self._update_from_bool)
         s = f"""QPushButton:!checked{{ background:{colors[0]}; border: 1px solid grey; }}
                 QPushButton:checked{{ background:{colors[1]}; border: 1px solid grey; }}"""
         pushButton.setStyleSheet(pushButton.styleSheet() + s + styleSheet_amendment)
@@ -893,7 +688,7 @@ class LoggedQuantity(QtCore.QObject):
     def change_choice_list(self, choices):
         #widget = self.widget
         with self.lock:
-            self.choices = self._expand_choices(choices)
+            self._set_choices(choices)
             
             for widget in self.widget_list:
                 if type(widget) == QtWidgets.QComboBox:
@@ -1152,6 +947,314 @@ class LoggedQuantity(QtCore.QObject):
             return p
         
 
+# Widget binders used by LoggedQuantity.connect_to_widget and
+# LoggedQuantity.connect_to_widget_one_way.
+# Each binder takes (lq, widget, bidir) and creates the signal-slot connections
+# between lq and widget. Widget to LQ connections are only made if bidir is True.
+
+def _bind_double_spinbox(lq, widget, bidir=True):
+    widget.setKeyboardTracking(False)
+    if lq.vmin is not None:
+        widget.setMinimum(lq.vmin)
+    if lq.vmax is not None:
+        widget.setMaximum(lq.vmax)
+    if lq.unit is not None:
+        widget.setSuffix(" "+lq.unit)
+    widget.setDecimals(lq.spinbox_decimals)
+    widget.setSingleStep(lq.spinbox_step)
+    widget.setValue(lq.val)
+    #events
+    def update_widget_value(x):
+        """
+        block signals from widget when value is set via lq.update_value.
+        This prevents signal-slot loops between widget and lq
+        """
+        try:
+            widget.blockSignals(True)
+            widget.setValue(x)
+        finally:
+            widget.blockSignals(False)                    
+    #lq.updated_value[float].connect(widget.setValue)
+    lq.updated_value[float].connect(update_widget_value)
+    #if not lq.ro:
+    if bidir:
+        widget.valueChanged[float].connect(lq._update_from_float)
+
+def _bind_minmax_slider(lq, widget, bidir=True):
+    lq.updated_value[float].connect(widget.update_value)
+    if bidir:
+        widget.updated_value[float].connect(lq._update_from_float)
+    if lq.unit is not None:
+        widget.setSuffix(lq.unit)
+    widget.setSingleStep(lq.spinbox_step)
+    widget.setDecimals(lq.spinbox_decimals)
+    widget.setRange(lq.vmin, lq.vmax)
+    widget.set_name(lq.name)
+
+def _bind_slider(lq, widget, bidir=True):
+    if lq.dtype == float:
+        lq.vrange = lq.vmax - lq.vmin
+        def transform_to_slider(x):
+            pct = 100*(x-lq.vmin)/lq.vrange
+            return int(pct)
+        def transform_from_slider(x):
+            val = lq.vmin + (x*lq.vrange/100)
+            return val
+        def update_widget_value(x):
+            """
+            block signals from widget when value is set via lq.update_value.
+            This prevents signal-slot loops between widget and lq
+            """
+            try:
+                widget.blockSignals(True)
+                widget.setValue(transform_to_slider(x))
+            finally:
+                widget.blockSignals(False)
+                
+        def update_spinbox(x):
+            lq.update_value(transform_from_slider(x))    
+        if lq.vmin is not None:
+            widget.setMinimum(transform_to_slider(lq.vmin))
+        if lq.vmax is not None:
+            widget.setMaximum(transform_to_slider(lq.vmax))
+        widget.setSingleStep(1)
+        widget.setValue(transform_to_slider(lq.val))
+        lq.updated_value[float].connect(update_widget_value)
+        if bidir:
+            widget.valueChanged[int].connect(update_spinbox)
+    elif lq.dtype == int:
+        lq.updated_value[int].connect(widget.setValue)
+        if bidir:
+            #widget.sliderMoved[int].connect(lq.update_value)
+            widget.valueChanged[int].connect(lq._update_from_int)
+        
+        widget.setSingleStep(1)            
+
+def _bind_checkbox(lq, widget, bidir=True):
+    def update_widget_value(x):
+        _lq = widget.sender()
+        #lq.log.debug("LQ {} update qcheckbox: {} arg{} lq value{}".format(_lq.name,   widget, x, _lq.value))                
+        widget.setChecked(_lq.value)                    
+
+    lq.updated_value[bool].connect(update_widget_value)
+    if bidir:
+        widget.clicked[bool].connect(lq._update_from_bool) # another option is stateChanged signal
+    if lq.ro:
+        #widget.setReadOnly(True)
+        widget.setEnabled(False)
+        
+    if lq.colors != None:
+        if len(lq.colors) in (2,3): # QCheckBoxes can have 3 states! (tristate)
+            if len(lq.colors) == 2:
+                colors = [lq.colors[0], 'lightgrey', lq.colors[1]]
+            elif len(lq.qcolors) == 3:
+                colors = lq.colors
+            s = f"""QCheckBox:!checked {{ background: {colors[0]} }}
+                    QCheckBox:checked  {{ background: {colors[2]} }}"""
+            widget.setStyleSheet(widget.styleSheet() + s)
+
+def _bind_line_edit(lq, widget, bidir=True):
+    # updated_text_value carries the same string as updated_value[str],
+    # connecting both would set the text twice on every update
+    lq.updated_text_value[str].connect(widget.setText)
+    if lq.ro:
+        widget.setReadOnly(True)  # FIXME
+    if bidir:
+        def on_edit_finished():
+            lq.log.debug(lq.name + " qLineEdit on_edit_finished")
+            try:
+                widget.blockSignals(True)
+                lq.update_value(widget.text())
+            finally:
+                widget.blockSignals(False)
+        widget.editingFinished.connect(on_edit_finished)
+
+def _bind_plain_text_edit(lq, widget, bidir=True):
+    # TODO Read only
+    
+    def on_lq_changed(new_text):
+        current_cursor = widget.textCursor()
+        current_cursor_pos = current_cursor.position()
+        #print('current_cursor', current_cursor, current_cursor.position())
+        widget.document().setPlainText(new_text)
+        current_cursor.setPosition(current_cursor_pos)
+        widget.setTextCursor(current_cursor)
+        #print('current_cursor', current_cursor, current_cursor.position())
+    
+    #lq.updated_text_value[str].connect(widget.document().setPlainText)
+    lq.updated_text_value[str].connect(on_lq_changed)
+    
+    if bidir:
+        def on_widget_textChanged():
+            try:
+                widget.blockSignals(True)
+                lq.update_value(widget.toPlainText())
+            finally:
+                widget.blockSignals(False)
+        widget.textChanged.connect(on_widget_textChanged)
+
+def _bind_combobox(lq, widget, bidir=True):
+    # need to have a choice list to connect to a QComboBox
+    assert lq.choices is not None 
+    widget.clear() # removes all old choices
+    for choice_name, choice_value in lq.choices:
+        widget.addItem(choice_name, choice_value)
+    lq.updated_choice_index_value[int].connect(widget.setCurrentIndex)
+    if bidir:
+        widget.currentIndexChanged.connect(lq.update_choice_index_value)
+    if lq.colors != None:
+        if len(lq.qcolors) == len(lq.choices):
+            for i,qcolor in enumerate(lq.qcolors):
+                widget.setItemData(i,  qcolor, QtCore.Qt.BackgroundRole )
+                
+            def update_background_color(idx):
+                qcolor = lq.qcolors[idx]
+                s = f"""QComboBox{{
+                            selection-background-color: {qcolor.name()};
+                            selection-color: black;
+                            background: {qcolor.name()};
+                            }}"""                      
+                widget.setStyleSheet(widget.styleSheet() + s)
+            widget.currentIndexChanged.connect(update_background_color)
+
+def _bind_pg_spinbox(lq, widget, bidir=True):
+    #widget.setFocusPolicy(QtCore.Qt.StrongFocus)
+    suffix = lq.unit
+    if lq.unit is None:
+        suffix = ""
+    if lq.dtype == int:
+        integer = True
+        minStep=1
+        step=1
+    else:
+        integer = False
+        minStep=.1
+        step=.1
+    opts = dict(
+                suffix=suffix,
+                siPrefix=True,
+                dec=True,
+                step=step,
+                minStep=minStep,
+                bounds=[lq.vmin, lq.vmax],
+                int=integer)
+    if lq.si:
+        del opts['step']
+        del opts['minStep']
+    
+    widget.setOpts(**opts)
+              
+    if lq.ro:
+        widget.setEnabled(False)
+        widget.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
+        widget.setReadOnly(True)
+    #widget.setDecimals(lq.spinbox_decimals)
+    if not lq.si:
+        widget.setSingleStep(lq.spinbox_step)
+    def update_widget_value(x):
+        """
+        block signals from widget when value is set via lq.update_value.
+        This prevents signal loops
+        """
+        try:
+            widget.blockSignals(True)
+            widget.setValue(x)
+        finally:
+            widget.blockSignals(False)                    
+    lq.updated_value[float].connect(update_widget_value)
+    if bidir:
+        def on_widget_update(_widget):
+            lq.update_value(_widget.value())
+        widget.sigValueChanged.connect(on_widget_update)
+
+def _bind_label(lq, widget, bidir=True):
+    lq.updated_text_value.connect(widget.setText)
+
+def _bind_progressbar(lq, widget, bidir=True):
+    def set_progressbar(x, widget=widget):
+        lq.log.debug("set_progressbar {}".format(x))
+        widget.setValue(int(x))
+    lq.updated_value.connect(set_progressbar)
+
+def _bind_lcd_number(lq, widget, bidir=True):
+    lq.updated_value[(lq.dtype)].connect(widget.display)
+
+# maps widget type --> binder function, lookup is done on the exact type of
+# the widget. Additional widget types can be supported by adding entries.
+_WIDGET_BINDERS = {
+    QtWidgets.QDoubleSpinBox: _bind_double_spinbox,
+    MinMaxQSlider: _bind_minmax_slider,
+    QtWidgets.QSlider: _bind_slider,
+    QtWidgets.QCheckBox: _bind_checkbox,
+    QtWidgets.QLineEdit: _bind_line_edit,
+    QtWidgets.QPlainTextEdit: _bind_plain_text_edit,
+    QtWidgets.QComboBox: _bind_combobox,
+    pyqtgraph.widgets.SpinBox.SpinBox: _bind_pg_spinbox,
+    QtWidgets.QLabel: _bind_label,
+    QtWidgets.QProgressBar: _bind_progressbar,
+    QtWidgets.QLCDNumber: _bind_lcd_number,
+    }
+
+
+class _DtypeLQ(LoggedQuantity):
+    """
+    Base of the LoggedQuantity subclasses specialized for a single builtin
+    dtype. These are created by :meth:`LQCollection.New` and replace the
+    generic dtype dispatch in coerce_to_type and friends.
+    """
+    
+    def __init__(self, name, **kwargs):
+        LoggedQuantity.__init__(self, name, **kwargs)
+        # log under the same name as a plain LoggedQuantity
+        self.log = logging.getLogger(LoggedQuantity.__name__)
+
+class _IntLQ(_DtypeLQ):
+    def coerce_to_type(self, x):
+        return int(x)
+
+    def coerce_to_str(self, x):
+        return str(x)
+
+class _FloatLQ(_DtypeLQ):
+    def coerce_to_type(self, x):
+        return float(x)
+
+    def coerce_to_str(self, x):
+        return str(x)
+
+class _StrLQ(_DtypeLQ):
+    def coerce_to_type(self, x):
+        return str(x)
+
+    def coerce_to_str(self, x):
+        return str(x)
+
+    def string_value(self):
+        return self.val
+
+class _BoolLQ(_DtypeLQ):
+    def coerce_to_type(self, x):
+        if isinstance(x, str):
+            return str2bool(x)
+        return bool(x)
+
+    def coerce_to_str(self, x):
+        return bool2str(x)
+
+# coerce_to_type implementations that return values of dtype unchanged
+_PLAIN_COERCE_TO_TYPE = (LoggedQuantity.coerce_to_type, _IntLQ.coerce_to_type,
+                         _FloatLQ.coerce_to_type, _StrLQ.coerce_to_type,
+                         _BoolLQ.coerce_to_type)
+
+# LQ class used by LQCollection.New for each dtype
+_DTYPE_LQ_CLASSES = {
+    int: _IntLQ, 'int': _IntLQ, 'uint': _IntLQ,
+    float: _FloatLQ, 'float': _FloatLQ, 'float32': _FloatLQ,
+    str: _StrLQ,
+    bool: _BoolLQ,
+    }
+
+
 class FileLQ(LoggedQuantity):
     """
     Specialized str type :class:`LoggedQuantity` that handles 
@@ -1245,17 +1348,16 @@ class ArrayLQ(LoggedQuantity):
         # threading lock
         self.lock = QLock(mode=0) # mode 0 is non-reentrant lock
         
+        self._bind_signals()
+        
         self.is_array = True
         
         self._tableView = None
         
 
     def same_values(self, v1, v2):
-        if v1.shape == v2.shape:
-            return np.all(v1 == v2)
-            self.log.debug("same_values %s %s" % (v2-v1, np.all(v1 == v2)))        
-        else:
-            return False
+        # array_equal returns early on a shape mismatch
+        return np.array_equal(v1, v2)
 
     def change_shape(self, newshape):
         #TODO
@@ -1268,28 +1370,37 @@ class ArrayLQ(LoggedQuantity):
         return json.dumps(self.val.tolist())
     
     def coerce_to_type(self, x):
-        #print type(x)
-        if type(x) in (unicode, str):
+        """
+        converts *x* (array, nested list or JSON string) to an array of the
+        LQ's dtype. Arrays are copied so that later changes by the caller
+        do not alter the LQ's value, except for read-only arrays that own
+        their data, which are used as is.
+        """
+        if isinstance(x, np.ndarray):
+            if x.dtype == self.dtype and x.flags.owndata and not x.flags.writeable:
+                return x
+            return np.array(x, dtype=self.dtype)
+        if isinstance(x, (unicode, str)):
             x = json.loads(x)
-            #print repr(x)
-        return np.array(x, dtype=self.dtype)
+        # a new array is created from the (nested) list, no copy needed
+        return np.asarray(x, dtype=self.dtype)
     
     def send_display_updates(self, force=False):
         with self.lock:            
             self.log.debug(self.name + ' send_display_updates')
+            if self._hold_display_updates(force):
+                return
             #print "send_display_updates: {} force={}".format(self.name, force)
-            if force or np.any(self.oldval != self.val):
+            if force or not self._same_values(self.oldval, self.val):
                 
                 #print "send display updates", self.name, self.val, self.oldval
-                str_val = self.string_value()
-                self.updated_value[str].emit(str_val)
-                self.updated_text_value.emit(str_val)
+                self._emit_string_value()
                     
                 #self.updated_value[float].emit(self.val)
                 #if self.dtype != float:
                 #    self.updated_value[int].emit(self.val)
                 #self.updated_value[bool].emit(self.val)
-                self.updated_value[()].emit()
+                self._emit_void()
                 
                 self.oldval = self.val
             else:
@@ -1370,10 +1481,17 @@ class LQCircularNetwork(QtCore.QObject):
         '''
         if self.locked == False:
             self.locked = True
-            for kev,val in kwargs.items():
-                self.lq_dict[kev].update_value(val)
-                self.updated_values.emit()
+            try:
+                # batch so that each lq sends its signals only once, while
+                # still locked
+                with ExitStack() as stack:
+                    for key in kwargs.keys():
+                        stack.enter_context(self.lq_dict[key].batch())
+                    for key, val in kwargs.items():
+                        self.lq_dict[key].update_value(val)
+            finally:
                 self.locked = False
+            self.updated_values.emit()
                 
     def add_lq(self, lq, name=None):
         if name is None:
@@ -1382,6 +1500,30 @@ class LQCircularNetwork(QtCore.QObject):
 
 
 
+def _calc_step(min_, max_, num):
+    if num == 1: #prevent division by zero
+        num = 2
+    return (max_-min_)/(num-1)
+
+def _linspace(min_, max_, num):
+    """equivalent to np.linspace(min_, max_, num) as an explicit loop for numba"""
+    out = np.empty(num)
+    if num == 1:
+        out[0] = min_
+    elif num > 1:
+        step = (max_-min_)/(num-1)
+        for i in range(num-1):
+            out[i] = min_ + i*step
+        out[num-1] = max_
+    return out
+
+if njit is not None:
+    _calc_step = njit(cache=True)(_calc_step)
+    _linspace = njit(cache=True)(_linspace)
+else:
+    _linspace = np.linspace
+
+
 class LQRange(LQCircularNetwork):
     """
     LQRange is a collection of logged quantities that describe a
@@ -1403,14 +1545,18 @@ class LQRange(LQCircularNetwork):
         self.center = center_lq
         self.span = span_lq
         
+        # last computed array and the (min, max, num) it was computed for
+        self._array_key = None
+        self._array_cache = None
+        
         lq_dict = {'min':self.min, 'max':self.max, 'num':self.num, 'step':self.step}        
         
-        if self.center == None: 
-            assert self.span == None, 'Invalid initialization of LQRange'
+        if self.center is None: 
+            assert self.span is None, 'Invalid initialization of LQRange'
         else:
             lq_dict.update({'center':self.center})
-        if self.span == None: 
-            assert self.center == None, 'Invalid initialization of LQRange'
+        if self.span is None: 
+            assert self.center is None, 'Invalid initialization of LQRange'
         else:
             lq_dict.update({'span':self.span})
         
@@ -1423,7 +1569,7 @@ class LQRange(LQCircularNetwork):
         '''        
         self.num.add_listener(self.on_change_num)
         self.step.add_listener(self.on_change_step)              
-        if self.center and self.span:
+        if self.center is not None and self.span is not None:
             self.center.add_listener(self.on_change_center_span)
             self.span.add_listener(self.on_change_center_span)
             self.min.add_listener(self.on_change_min_max)
@@ -1461,10 +1607,7 @@ class LQRange(LQCircularNetwork):
         excludes num=1 to prevent division by zero,
         returns step
         """
-        if num==1: #prevent division by zero
-            num = 2
-        step=(max_-min_)/(num-1)
-        return step
+        return _calc_step(min_, max_, num)
     
     def calc_span(self, min_, max_):
         return (max_-min_)
@@ -1479,12 +1622,19 @@ class LQRange(LQCircularNetwork):
     def calc_max(self, center, span):
         return center+span/2.0  
     
+    # the on_change_* listeners return early while update_values_synchronously
+    # is running, as the values they would compute are already being set
+    
     def on_change_step(self):
+        if self.locked:
+            return
         step = self.step.val
         num,step = self.calc_num(self.min.val, self.max.val, step)
         self.update_values_synchronously(num=num, step=step)
         
     def on_change_num(self):
+        if self.locked:
+            return
         num = self.num.val
         if num ==1:
             num = 2
@@ -1492,6 +1642,8 @@ class LQRange(LQCircularNetwork):
         self.update_values_synchronously(num=num,step=step)
                
     def on_change_min_max(self):
+        if self.locked:
+            return
         min_ = self.min.val
         max_ = self.max.val
         span = self.calc_span(min_, max_)
@@ -1499,6 +1651,8 @@ class LQRange(LQCircularNetwork):
         self.update_values_synchronously(span=span, center=center)
         
     def on_change_center_span(self):
+        if self.locked:
+            return
         span = self.span.val
         center = self.center.val
         min_ = self.calc_min(center, span)
@@ -1507,7 +1661,12 @@ class LQRange(LQCircularNetwork):
     
     @property
     def array(self):
-        return np.linspace(self.min.val, self.max.val, self.num.val)
+        key = (self.min.val, self.max.val, self.num.val)
+        if key != self._array_key:
+            self._array_cache = _linspace(*key)
+            self._array_key = key
+        # return a copy as callers may keep or modify the array
+        return self._array_cache.copy()
     
     def zig_zag_sweep_array(self):
         mid_arg = int(self.num.val/2)
@@ -1603,9 +1762,13 @@ class LQCollection(object):
     """
 
     def __init__(self):
-        self._logged_quantities = OrderedDict()
-        self.ranges = OrderedDict()
-        self.vectors = OrderedDict()
+        # dicts preserve insertion order (python >= 3.7)
+        self._logged_quantities = dict()
+        self.ranges = dict()
+        self.vectors = dict()
+        
+        # bound lookup used by the accessors below
+        self._lq_get = self._logged_quantities.__getitem__
         
         self.log = get_logger_from_class(self)
         
@@ -1622,7 +1785,8 @@ class LQCollection(object):
             if dtype == 'file':
                 lq = FileLQ(name=name, **kwargs)
             else:
-                lq = LoggedQuantity(name=name, dtype=dtype, **kwargs)
+                lq_class = _DTYPE_LQ_CLASSES.get(dtype, LoggedQuantity)
+                lq = lq_class(name=name, dtype=dtype, **kwargs)
 
         return self.Add(lq)
     
@@ -1638,14 +1802,36 @@ class LQCollection(object):
         return lq
 
     def get_lq(self, key):
-        return self._logged_quantities[key]
+        return self._lq_get(key)
     
     def get_val(self, key):
-        return self._logged_quantities[key].val
+        return self._lq_get(key).val
     
     def as_list(self):
         return self._logged_quantities.values()
     
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that batches display updates of all LQ's in the
+        collection, see :meth:`LoggedQuantity.batch`
+        """
+        with ExitStack() as stack:
+            for lq in self.as_list():
+                stack.enter_context(lq.batch())
+            yield self
+    
+    @contextmanager
+    def suppress(self):
+        """
+        Context manager that suppresses display updates of all LQ's in the
+        collection, see :meth:`LoggedQuantity.suppress`
+        """
+        with ExitStack() as stack:
+            for lq in self.as_list():
+                stack.enter_context(lq.suppress())
+            yield self
+    
     def as_dict(self):
         return self._logged_quantities
     
@@ -1670,12 +1856,12 @@ class LQCollection(object):
     
     def __getitem__(self, key):
         "Dictionary-like access reads and sets value of LQ's"
-        return self._logged_quantities[key].val
+        return self._lq_get(key).val
     
     
     def __setitem__(self, key, item):
         "Dictionary-like access reads and sets value of LQ's"
-        self._logged_quantities[key].update_value(item)
+        self._lq_get(key).update_value(item)
 
     def __contains__(self, key):
         return self._logged_quantities.__contains__(key)